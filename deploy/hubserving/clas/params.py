@@ -27,7 +27,7 @@ def get_default_confg():
             'enable_mkldnn': False,
             'cpu_num_threads': 1,
             'use_tensorrt': False,
-            'ir_optim': False,
+            'ir_optim': True,
             "gpu_mem": 8000,
             'enable_profile': False,
             "enable_benchmark": False
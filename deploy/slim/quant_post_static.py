@@ -56,6 +56,12 @@ def main():
 
         return __reader__
 
+    # optional settings, e.g. calibration algo and quantizable op types
+    quant_config = {}
+    if config.get("Slim", None) and config["Slim"].get("quant_post_static",
+                                                       None):
+        quant_config = config["Slim"]["quant_post_static"]
+
     paddle.enable_static()
     place = paddle.CPUPlace()
     exe = paddle.static.Executor(place)
@@ -66,8 +72,15 @@ def main():
         params_filename='inference.pdiparams',
         quantize_model_path=os.path.join(
             config["Global"]["save_inference_dir"], "quant_post_static_model"),
+        save_model_filename='inference.pdmodel',
+        save_params_filename='inference.pdiparams',
         sample_generator=sample_generator(train_dataloader),
-        batch_nums=10)
+        batch_size=quant_config.get("batch_size", 16),
+        batch_nums=quant_config.get("batch_nums", 10),
+        algo=quant_config.get("algo", "hist"),
+        quantizable_op_type=quant_config.get(
+            "quantizable_op_type", ["conv2d", "depthwise_conv2d", "mul"]),
+        optimize_model=quant_config.get("optimize_model", False))
 
 
 if __name__ == "__main__":
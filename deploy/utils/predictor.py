@@ -18,6 +18,7 @@ import shutil
 import cv2
 import numpy as np
 
+import paddle
 from paddle.inference import Config
 from paddle.inference import create_predictor
 
@@ -27,6 +28,9 @@ class Predictor(object):
         # HALF precission predict only work when using tensorrt
         if args.use_fp16 is True:
             assert args.use_tensorrt is True
+        # so does INT8 precision predict
+        if args.get("use_int8", False) is True:
+            assert args.use_tensorrt is True
         self.args = args
         self.paddle_predictor, self.config = self.create_paddle_predictor(
             args, inference_model_dir)
@@ -43,11 +47,21 @@ class Predictor(object):
 
         if args.use_gpu:
             config.enable_use_gpu(args.gpu_mem, 0)
+            if args.get("cudnn_exhaustive_search", False):
+                # benchmark all cudnn conv algos (e.g. winograd) per shape
+                # once, with a larger workspace (MB) to allow them
+                paddle.set_flags({
+                    "FLAGS_cudnn_exhaustive_search": True,
+                    "FLAGS_conv_workspace_size_limit": 4096
+                })
         else:
             config.disable_gpu()
             if args.enable_mkldnn:
-                # cache 10 different shapes for mkldnn to avoid memory leak
-                config.set_mkldnn_cache_capacity(10)
+                # cache a limited number of shapes (Global.mkldnn_cache_capacity,
+                # default 10) for mkldnn to avoid memory leak, weights are
+                # reordered again once a shape is evicted
+                config.set_mkldnn_cache_capacity(
+                    args.get("mkldnn_cache_capacity", 10))
                 config.enable_mkldnn()
         config.set_cpu_math_library_num_threads(args.cpu_num_threads)
 
@@ -56,11 +70,19 @@ class Predictor(object):
         config.disable_glog_info()
         config.switch_ir_optim(args.ir_optim)  # default true
         if args.use_tensorrt:
+            if args.get("use_int8", False):
+                precision = Config.Precision.Int8
+            elif args.use_fp16:
+                precision = Config.Precision.Half
+            else:
+                precision = Config.Precision.Float32
+            # calibration is not needed for PaddleSlim quantized models
             config.enable_tensorrt_engine(
-                precision_mode=Config.Precision.Half
-                if args.use_fp16 else Config.Precision.Float32,
+                precision_mode=precision,
                 max_batch_size=args.batch_size,
-                min_subgraph_size=30)
+                min_subgraph_size=30,
+                use_calib_mode=args.get("use_calib_mode", True)
+                if precision == Config.Precision.Int8 else False)
 
         config.enable_memory_optim()
         # use zero copy
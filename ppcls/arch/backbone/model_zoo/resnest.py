@@ -24,7 +24,7 @@ import paddle.nn.functional as F
 from paddle import ParamAttr
 from paddle.nn.initializer import KaimingNormal
 from paddle.nn import Conv2D, BatchNorm, Linear, Dropout
-from paddle.nn import AdaptiveAvgPool2D, MaxPool2D, AvgPool2D
+from paddle.nn import MaxPool2D, AvgPool2D
 from paddle.regularizer import L2Decay
 
 from ppcls.utils.save_load import load_dygraph_pretrain, load_dygraph_pretrain_from_url
@@ -41,6 +41,20 @@ MODEL_URLS = {
 __all__ = list(MODEL_URLS.keys())
 
 
+@paddle.no_grad()
+def _fuse_conv_bn(conv, bn):
+    # W' = W * gamma / std, b' = beta - mean * gamma / std
+    std = (bn._variance + bn._epsilon).sqrt()
+    scale = bn.weight / std
+    conv.weight.set_value(conv.weight * scale.reshape([-1, 1, 1, 1]))
+    if conv.bias is None:
+        conv.bias = conv.create_parameter(
+            shape=[conv.weight.shape[0]], is_bias=True)
+        conv.bias.set_value(bn.bias - bn._mean * scale)
+    else:
+        conv.bias.set_value(bn.bias + (conv.bias - bn._mean) * scale)
+
+
 class ConvBNLayer(nn.Layer):
     def __init__(self,
                  num_channels,
@@ -50,9 +64,11 @@ class ConvBNLayer(nn.Layer):
                  dilation=1,
                  groups=1,
                  act=None,
-                 name=None):
+                 name=None,
+                 data_format="NCHW"):
         super(ConvBNLayer, self).__init__()
 
+        self.act = act
         bn_decay = 0.0
 
         self._conv = Conv2D(
@@ -64,7 +80,8 @@ class ConvBNLayer(nn.Layer):
             dilation=dilation,
             groups=groups,
             weight_attr=ParamAttr(name=name + "_weight"),
-            bias_attr=False)
+            bias_attr=False,
+            data_format=data_format)
         self._batch_norm = BatchNorm(
             num_filters,
             act=act,
@@ -73,35 +90,64 @@ class ConvBNLayer(nn.Layer):
             bias_attr=ParamAttr(
                 name + "_offset", regularizer=L2Decay(bn_decay)),
             moving_mean_name=name + "_mean",
-            moving_variance_name=name + "_variance")
+            moving_variance_name=name + "_variance",
+            data_layout=data_format)
 
     def forward(self, x):
         x = self._conv(x)
-        x = self._batch_norm(x)
+        if self._batch_norm is not None:
+            x = self._batch_norm(x)
+        elif self.act == "relu" and paddle.in_dynamic_mode():
+            # only reached after fuse_bn_eval, reuse the conv output buffer
+            x = F.relu_(x)
+        elif self.act is not None:
+            x = getattr(F, self.act)(x)
         return x
 
+    def fuse_bn_eval(self):
+        # fold _batch_norm into _conv, the layer can not be trained afterwards
+        assert not self.training, "BN can only be fused in eval mode."
+        if self._batch_norm is not None:
+            _fuse_conv_bn(self._conv, self._batch_norm)
+            self._batch_norm = None
+
 
 class rSoftmax(nn.Layer):
-    def __init__(self, radix, cardinality):
+    def __init__(self, radix, cardinality, data_format="NCHW"):
         super(rSoftmax, self).__init__()
         self.radix = radix
         self.cardinality = cardinality
+        self.data_format = data_format
 
     def forward(self, x):
         cardinality = self.cardinality
         radix = self.radix
 
-        batch, r, h, w = x.shape
+        if self.data_format == "NHWC":
+            batch, h, w, r = x.shape
+        else:
+            batch, r, h, w = x.shape
         if self.radix > 1:
-            x = paddle.reshape(
-                x=x,
-                shape=[
-                    batch, cardinality, radix,
-                    int(r * h * w / cardinality / radix)
-                ])
-            x = paddle.transpose(x=x, perm=[0, 2, 1, 3])
+            # h == w == 1 here, so NCHW and NHWC share the same memory order
+            channels = int(r * h * w / radix)
+            if cardinality == 1:
+                # the [cardinality, radix] transpose is a no-op for one group
+                x = paddle.reshape(x=x, shape=[batch, radix, channels])
+            else:
+                x = paddle.reshape(
+                    x=x,
+                    shape=[
+                        batch, cardinality, radix,
+                        int(r * h * w / cardinality / radix)
+                    ])
+                x = paddle.transpose(x=x, perm=[0, 2, 1, 3])
             x = nn.functional.softmax(x, axis=1)
-            x = paddle.reshape(x=x, shape=[batch, r * h * w, 1, 1])
+            # keep the radix axis, so the attention broadcasts directly over
+            # the reshaped splits in SplatConv
+            if self.data_format == "NHWC":
+                x = paddle.reshape(x=x, shape=[batch, 1, 1, radix, channels])
+            else:
+                x = paddle.reshape(x=x, shape=[batch, radix, channels, 1, 1])
         else:
             x = nn.functional.sigmoid(x)
         return x
@@ -120,10 +166,16 @@ class SplatConv(nn.Layer):
                  radix=2,
                  reduction_factor=4,
                  rectify_avg=False,
-                 name=None):
+                 name=None,
+                 data_format="NCHW"):
         super(SplatConv, self).__init__()
 
         self.radix = radix
+        self.channels = channels
+        self.data_format = data_format
+        # the radix splits are laid out as [N, radix, C, H, W] or
+        # [N, H, W, radix, C] after reshaping the conv1 output
+        self.radix_axis = 3 if data_format == "NHWC" else 1
 
         self.conv1 = ConvBNLayer(
             num_channels=in_channels,
@@ -132,9 +184,11 @@ class SplatConv(nn.Layer):
             stride=stride,
             groups=groups * radix,
             act="relu",
-            name=name + "_1_weights")
+            name=name + "_1_weights",
+            data_format=data_format)
 
-        self.avg_pool2d = AdaptiveAvgPool2D(1)
+        # global average pooling is done with a plain mean reduction
+        self.spatial_axes = [1, 2] if data_format == "NHWC" else [2, 3]
 
         inter_channels = int(max(in_channels * radix // reduction_factor, 32))
 
@@ -146,7 +200,8 @@ class SplatConv(nn.Layer):
             stride=1,
             groups=groups,
             act="relu",
-            name=name + "_2_weights")
+            name=name + "_2_weights",
+            data_format=data_format)
 
         # to calc atten
         self.conv3 = Conv2D(
@@ -158,31 +213,41 @@ class SplatConv(nn.Layer):
             groups=groups,
             weight_attr=ParamAttr(
                 name=name + "_weights", initializer=KaimingNormal()),
-            bias_attr=False)
+            bias_attr=False,
+            data_format=data_format)
 
-        self.rsoftmax = rSoftmax(radix=radix, cardinality=groups)
+        self.rsoftmax = rSoftmax(
+            radix=radix, cardinality=groups, data_format=data_format)
 
     def forward(self, x):
         x = self.conv1(x)
 
         if self.radix > 1:
-            splited = paddle.split(x, num_or_sections=self.radix, axis=1)
-            gap = paddle.add_n(splited)
+            if self.data_format == "NHWC":
+                x = paddle.reshape(
+                    x, shape=[0, 0, 0, self.radix, self.channels])
+            else:
+                # static h and w in dygraph; take them at runtime when
+                # exporting, so the saved model accepts any input size
+                x_shape = x.shape if paddle.in_dynamic_mode(
+                ) else paddle.shape(x)
+                x = paddle.reshape(
+                    x,
+                    shape=[
+                        0, self.radix, self.channels, x_shape[2], x_shape[3]
+                    ])
+            gap = paddle.sum(x, axis=self.radix_axis)
         else:
             gap = x
 
-        gap = self.avg_pool2d(gap)
+        gap = paddle.mean(gap, axis=self.spatial_axes, keepdim=True)
         gap = self.conv2(gap)
 
         atten = self.conv3(gap)
         atten = self.rsoftmax(atten)
 
         if self.radix > 1:
-            attens = paddle.split(atten, num_or_sections=self.radix, axis=1)
-            y = paddle.add_n([
-                paddle.multiply(split, att)
-                for (att, split) in zip(attens, splited)
-            ])
+            y = paddle.sum(paddle.multiply(x, atten), axis=self.radix_axis)
         else:
             y = paddle.multiply(x, atten)
 
@@ -204,7 +269,8 @@ class BottleneckBlock(nn.Layer):
                  rectify_avg=False,
                  last_gamma=False,
                  avg_down=False,
-                 name=None):
+                 name=None,
+                 data_format="NCHW"):
         super(BottleneckBlock, self).__init__()
         self.inplanes = inplanes
         self.planes = planes
@@ -218,8 +284,21 @@ class BottleneckBlock(nn.Layer):
         self.rectify_avg = rectify_avg
         self.last_gamma = last_gamma
         self.avg_down = avg_down
+        self.data_format = data_format
+        # the branch predicates are constant after construction
+        self._use_pool1 = bool(avd and avd_first and (stride > 1 or is_first))
+        self._use_pool2 = bool(
+            avd and not avd_first and (stride > 1 or is_first))
+        self._use_shortcut = bool(stride != 1 or inplanes != planes * 4)
 
         group_width = int(planes * (bottleneck_width / 64.)) * cardinality
+        self.group_width = group_width
+        # conv1 and the shortcut conv4 in one conv, see fuse_shortcut_conv
+        self.conv_fused = None
+        self._fused_sections = [group_width, planes * 4]
+        self._channel_axis = 3 if data_format == "NHWC" else 1
+        # set by ResNeSt.fuse_for_inference, see forward
+        self._inplace_residual = False
 
         self.conv1 = ConvBNLayer(
             num_channels=self.inplanes,
@@ -228,11 +307,15 @@ class BottleneckBlock(nn.Layer):
             stride=1,
             groups=1,
             act="relu",
-            name=name + "_conv1")
+            name=name + "_conv1",
+            data_format=data_format)
 
-        if avd and avd_first and (stride > 1 or is_first):
+        if self._use_pool1:
             self.avg_pool2d_1 = AvgPool2D(
-                kernel_size=3, stride=stride, padding=1)
+                kernel_size=3,
+                stride=stride,
+                padding=1,
+                data_format=data_format)
 
         if radix >= 1:
             self.conv2 = SplatConv(
@@ -246,7 +329,8 @@ class BottleneckBlock(nn.Layer):
                 bias=False,
                 radix=radix,
                 rectify_avg=rectify_avg,
-                name=name + "_splat")
+                name=name + "_splat",
+                data_format=data_format)
         else:
             self.conv2 = ConvBNLayer(
                 num_channels=group_width,
@@ -256,11 +340,15 @@ class BottleneckBlock(nn.Layer):
                 dilation=dilation,
                 groups=cardinality,
                 act="relu",
-                name=name + "_conv2")
+                name=name + "_conv2",
+                data_format=data_format)
 
-        if avd and avd_first == False and (stride > 1 or is_first):
+        if self._use_pool2:
             self.avg_pool2d_2 = AvgPool2D(
-                kernel_size=3, stride=stride, padding=1)
+                kernel_size=3,
+                stride=stride,
+                padding=1,
+                data_format=data_format)
 
         self.conv3 = ConvBNLayer(
             num_channels=group_width,
@@ -269,17 +357,21 @@ class BottleneckBlock(nn.Layer):
             stride=1,
             groups=1,
             act=None,
-            name=name + "_conv3")
+            name=name + "_conv3",
+            data_format=data_format)
+
+        if self._use_shortcut:
+            # an AvgPool2D with kernel_size=1 and stride=1 is an identity,
+            # so the shortcut is only pooled when it is downsampled
+            self.avg_pool2d_3 = None
+            if avg_down and dilation == 1 and stride > 1:
+                self.avg_pool2d_3 = AvgPool2D(
+                    kernel_size=stride,
+                    stride=stride,
+                    padding=0,
+                    data_format=data_format)
 
-        if stride != 1 or self.inplanes != self.planes * 4:
             if avg_down:
-                if dilation == 1:
-                    self.avg_pool2d_3 = AvgPool2D(
-                        kernel_size=stride, stride=stride, padding=0)
-                else:
-                    self.avg_pool2d_3 = AvgPool2D(
-                        kernel_size=1, stride=1, padding=0, ceil_mode=True)
-
                 self.conv4 = Conv2D(
                     in_channels=self.inplanes,
                     out_channels=planes * 4,
@@ -289,7 +381,8 @@ class BottleneckBlock(nn.Layer):
                     groups=1,
                     weight_attr=ParamAttr(
                         name=name + "_weights", initializer=KaimingNormal()),
-                    bias_attr=False)
+                    bias_attr=False,
+                    data_format=data_format)
             else:
                 self.conv4 = Conv2D(
                     in_channels=self.inplanes,
@@ -301,7 +394,8 @@ class BottleneckBlock(nn.Layer):
                     weight_attr=ParamAttr(
                         name=name + "_shortcut_weights",
                         initializer=KaimingNormal()),
-                    bias_attr=False)
+                    bias_attr=False,
+                    data_format=data_format)
 
             bn_decay = 0.0
             self._batch_norm = BatchNorm(
@@ -313,35 +407,84 @@ class BottleneckBlock(nn.Layer):
                 bias_attr=ParamAttr(
                     name + "_shortcut_offset", regularizer=L2Decay(bn_decay)),
                 moving_mean_name=name + "_shortcut_mean",
-                moving_variance_name=name + "_shortcut_variance")
+                moving_variance_name=name + "_shortcut_variance",
+                data_layout=data_format)
 
     def forward(self, x):
         short = x
 
-        x = self.conv1(x)
-        if self.avd and self.avd_first and (self.stride > 1 or self.is_first):
+        if self.conv_fused is not None:
+            x, short = paddle.split(
+                self.conv_fused(x),
+                num_or_sections=self._fused_sections,
+                axis=self._channel_axis)
+            if paddle.in_dynamic_mode():
+                # the split output is a fresh tensor, relu can run in place
+                x = F.relu_(x)
+            else:
+                x = F.relu(x)
+        else:
+            x = self.conv1(x)
+        if self._use_pool1:
             x = self.avg_pool2d_1(x)
 
         x = self.conv2(x)
 
-        if self.avd and self.avd_first == False and (self.stride > 1 or
-                                                     self.is_first):
+        if self._use_pool2:
             x = self.avg_pool2d_2(x)
 
         x = self.conv3(x)
 
-        if self.stride != 1 or self.inplanes != self.planes * 4:
-            if self.avg_down:
+        if self._use_shortcut and self.conv_fused is None:
+            if self.avg_pool2d_3 is not None:
                 short = self.avg_pool2d_3(short)
 
             short = self.conv4(short)
 
-            short = self._batch_norm(short)
+            if self._batch_norm is not None:
+                short = self._batch_norm(short)
 
-        y = paddle.add(x=short, y=x)
-        y = F.relu(y)
+        if self._inplace_residual and paddle.in_dynamic_mode():
+            # write the residual sum into the conv3 output buffer, only
+            # enabled after fuse_for_inference. Forward post hooks on conv3
+            # would see their output overwritten by the sum.
+            y = F.relu_(x.add_(short))
+        else:
+            y = paddle.add(x=short, y=x)
+            y = F.relu(y)
         return y
 
+    def fuse_bn_eval(self):
+        # fold the shortcut _batch_norm into conv4
+        assert not self.training, "BN can only be fused in eval mode."
+        if self._use_shortcut and self._batch_norm is not None:
+            _fuse_conv_bn(self.conv4, self._batch_norm)
+            self._batch_norm = None
+
+    @paddle.no_grad()
+    def fuse_shortcut_conv(self):
+        # when conv4 reads the block input at stride 1 just like conv1, run
+        # both 1x1 convs as one conv and split the output, only valid after
+        # fuse_bn_eval
+        if not self._use_shortcut or self.conv_fused is not None or \
+                self.avg_pool2d_3 is not None or \
+                (not self.avg_down and self.stride != 1):
+            return
+        assert self.conv1._batch_norm is None and self._batch_norm is None, \
+            "fuse_bn_eval should be called before fuse_shortcut_conv."
+        self.conv_fused = Conv2D(
+            in_channels=self.inplanes,
+            out_channels=self.group_width + self.planes * 4,
+            kernel_size=1,
+            data_format=self.data_format)
+        self.conv_fused.weight.set_value(
+            paddle.concat([self.conv1._conv.weight, self.conv4.weight],
+                          axis=0))
+        self.conv_fused.bias.set_value(
+            paddle.concat([self.conv1._conv.bias, self.conv4.bias]))
+        self.conv1 = None
+        self.conv4 = None
+
 
 class ResNeStLayer(nn.Layer):
     def __init__(self,
@@ -359,7 +502,8 @@ class ResNeStLayer(nn.Layer):
                  stride=1,
                  dilation=1,
                  is_first=True,
-                 name=None):
+                 name=None,
+                 data_format="NCHW"):
         super(ResNeStLayer, self).__init__()
         self.inplanes = inplanes
         self.planes = planes
@@ -374,44 +518,29 @@ class ResNeStLayer(nn.Layer):
         self.last_gamma = last_gamma
         self.is_first = is_first
 
-        if dilation == 1 or dilation == 2:
-            bottleneck_func = self.add_sublayer(
-                name + "_bottleneck_0",
-                BottleneckBlock(
-                    inplanes=self.inplanes,
-                    planes=planes,
-                    stride=stride,
-                    radix=radix,
-                    cardinality=cardinality,
-                    bottleneck_width=bottleneck_width,
-                    avg_down=self.avg_down,
-                    avd=avd,
-                    avd_first=avd_first,
-                    dilation=1,
-                    is_first=is_first,
-                    rectify_avg=rectify_avg,
-                    last_gamma=last_gamma,
-                    name=name + "_bottleneck_0"))
-        elif dilation == 4:
-            bottleneck_func = self.add_sublayer(
-                name + "_bottleneck_0",
-                BottleneckBlock(
-                    inplanes=self.inplanes,
-                    planes=planes,
-                    stride=stride,
-                    radix=radix,
-                    cardinality=cardinality,
-                    bottleneck_width=bottleneck_width,
-                    avg_down=self.avg_down,
-                    avd=avd,
-                    avd_first=avd_first,
-                    dilation=2,
-                    is_first=is_first,
-                    rectify_avg=rectify_avg,
-                    last_gamma=last_gamma,
-                    name=name + "_bottleneck_0"))
-        else:
+        if dilation not in [1, 2, 4]:
             raise RuntimeError("=>unknown dilation size")
+        # the first block uses dilation 1, or 2 when the stage dilation is 4
+        first_dilation = 2 if dilation == 4 else 1
+
+        bottleneck_func = self.add_sublayer(
+            name + "_bottleneck_0",
+            BottleneckBlock(
+                inplanes=self.inplanes,
+                planes=planes,
+                stride=stride,
+                radix=radix,
+                cardinality=cardinality,
+                bottleneck_width=bottleneck_width,
+                avg_down=self.avg_down,
+                avd=avd,
+                avd_first=avd_first,
+                dilation=first_dilation,
+                is_first=is_first,
+                rectify_avg=rectify_avg,
+                last_gamma=last_gamma,
+                name=name + "_bottleneck_0",
+                data_format=data_format))
 
         self.inplanes = planes * 4
         self.bottleneck_block_list = [bottleneck_func]
@@ -432,7 +561,8 @@ class ResNeStLayer(nn.Layer):
                     dilation=dilation,
                     rectify_avg=rectify_avg,
                     last_gamma=last_gamma,
-                    name=curr_name))
+                    name=curr_name,
+                    data_format=data_format))
             self.bottleneck_block_list.append(bottleneck_func)
 
     def forward(self, x):
@@ -457,7 +587,8 @@ class ResNeSt(nn.Layer):
                  avd_first=False,
                  final_drop=0.0,
                  last_gamma=False,
-                 class_num=1000):
+                 class_num=1000,
+                 data_format="NCHW"):
         super(ResNeSt, self).__init__()
 
         self.cardinality = groups
@@ -479,6 +610,7 @@ class ResNeSt(nn.Layer):
         self.dilation = dilation
 
         self.rectify_avg = rectify_avg
+        self.data_format = data_format
 
         if self.deep_stem:
             self.stem = nn.Sequential(
@@ -488,19 +620,22 @@ class ResNeSt(nn.Layer):
                     filter_size=3,
                     stride=2,
                     act="relu",
-                    name="conv1")), ("conv2", ConvBNLayer(
+                    name="conv1",
+                    data_format=data_format)), ("conv2", ConvBNLayer(
                         num_channels=stem_width,
                         num_filters=stem_width,
                         filter_size=3,
                         stride=1,
                         act="relu",
-                        name="conv2")), ("conv3", ConvBNLayer(
+                        name="conv2",
+                        data_format=data_format)), ("conv3", ConvBNLayer(
                             num_channels=stem_width,
                             num_filters=stem_width * 2,
                             filter_size=3,
                             stride=1,
                             act="relu",
-                            name="conv3")))
+                            name="conv3",
+                            data_format=data_format)))
         else:
             self.stem = ConvBNLayer(
                 num_channels=3,
@@ -508,9 +643,11 @@ class ResNeSt(nn.Layer):
                 filter_size=7,
                 stride=2,
                 act="relu",
-                name="conv1")
+                name="conv1",
+                data_format=data_format)
 
-        self.max_pool2d = MaxPool2D(kernel_size=3, stride=2, padding=1)
+        self.max_pool2d = MaxPool2D(
+            kernel_size=3, stride=2, padding=1, data_format=data_format)
 
         self.layer1 = ResNeStLayer(
             inplanes=self.stem_width * 2
@@ -528,7 +665,8 @@ class ResNeSt(nn.Layer):
             stride=1,
             dilation=1,
             is_first=False,
-            name="layer1")
+            name="layer1",
+            data_format=data_format)
 
         #         return
 
@@ -545,7 +683,8 @@ class ResNeSt(nn.Layer):
             rectify_avg=rectify_avg,
             last_gamma=last_gamma,
             stride=2,
-            name="layer2")
+            name="layer2",
+            data_format=data_format)
 
         if self.dilated or self.dilation == 4:
             self.layer3 = ResNeStLayer(
@@ -562,7 +701,8 @@ class ResNeSt(nn.Layer):
                 last_gamma=last_gamma,
                 stride=1,
                 dilation=2,
-                name="layer3")
+                name="layer3",
+                data_format=data_format)
             self.layer4 = ResNeStLayer(
                 inplanes=1024,
                 planes=512,
@@ -577,7 +717,8 @@ class ResNeSt(nn.Layer):
                 last_gamma=last_gamma,
                 stride=1,
                 dilation=4,
-                name="layer4")
+                name="layer4",
+                data_format=data_format)
         elif self.dilation == 2:
             self.layer3 = ResNeStLayer(
                 inplanes=512,
@@ -593,7 +734,8 @@ class ResNeSt(nn.Layer):
                 last_gamma=last_gamma,
                 stride=2,
                 dilation=1,
-                name="layer3")
+                name="layer3",
+                data_format=data_format)
             self.layer4 = ResNeStLayer(
                 inplanes=1024,
                 planes=512,
@@ -608,7 +750,8 @@ class ResNeSt(nn.Layer):
                 last_gamma=last_gamma,
                 stride=1,
                 dilation=2,
-                name="layer4")
+                name="layer4",
+                data_format=data_format)
         else:
             self.layer3 = ResNeStLayer(
                 inplanes=512,
@@ -623,7 +766,8 @@ class ResNeSt(nn.Layer):
                 rectify_avg=rectify_avg,
                 last_gamma=last_gamma,
                 stride=2,
-                name="layer3")
+                name="layer3",
+                data_format=data_format)
             self.layer4 = ResNeStLayer(
                 inplanes=1024,
                 planes=512,
@@ -637,9 +781,10 @@ class ResNeSt(nn.Layer):
                 rectify_avg=rectify_avg,
                 last_gamma=last_gamma,
                 stride=2,
-                name="layer4")
+                name="layer4",
+                data_format=data_format)
 
-        self.pool2d_avg = AdaptiveAvgPool2D(1)
+        self.spatial_axes = [1, 2] if data_format == "NHWC" else [2, 3]
 
         self.out_channels = 2048
 
@@ -654,19 +799,38 @@ class ResNeSt(nn.Layer):
             bias_attr=ParamAttr(name="fc_offset"))
 
     def forward(self, x):
-        x = self.stem(x)
-        x = self.max_pool2d(x)
-        x = self.layer1(x)
-        x = self.layer2(x)
-
-        x = self.layer3(x)
-
-        x = self.layer4(x)
-        x = self.pool2d_avg(x)
-        x = paddle.reshape(x, shape=[-1, self.out_channels])
-        x = self.out(x)
+        with paddle.static.amp.fp16_guard():
+            if self.data_format == "NHWC":
+                x = paddle.transpose(x, [0, 2, 3, 1])
+                x.stop_gradient = True
+            x = self.stem(x)
+            x = self.max_pool2d(x)
+            x = self.layer1(x)
+            x = self.layer2(x)
+
+            x = self.layer3(x)
+
+            x = self.layer4(x)
+            x = paddle.mean(x, axis=self.spatial_axes)
+            x = self.out(x)
         return x
 
+    def fuse_for_inference(self):
+        """
+        Fold every BatchNorm into its preceding conv for inference, and
+        merge conv1 with the shortcut conv where both read the same input.
+        The residual add and relu of each block are then done in place.
+        The model is switched to eval mode and can not be trained afterwards.
+        """
+        self.eval()
+        for layer in self.sublayers():
+            if isinstance(layer, (ConvBNLayer, BottleneckBlock)):
+                layer.fuse_bn_eval()
+        for layer in self.sublayers():
+            if isinstance(layer, BottleneckBlock):
+                layer.fuse_shortcut_conv()
+                layer._inplace_residual = True
+
 
 def _load_pretrained(pretrained, model, model_url, use_ssld=False):
     if pretrained is False:
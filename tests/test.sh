@@ -319,10 +319,7 @@ if [ ${MODE} = "infer" ]; then
 	eval $command
 	last_status=${PIPESTATUS[0]}
 	status_check $last_status "${command}" "${status_log}"
-	cd inference/quant_post_static_model
-	ln -s __model__ inference.pdmodel
-	ln -s __params__ inference.pdiparams
-	cd ../../deploy
+	cd deploy
 	is_quant=True
         func_inference "${python}" "${inference_py}" "${infer_model}/quant_post_static_model" "../${LOG_PATH}" "${infer_img_dir}" ${is_quant}
 	cd ..